@@ -6,26 +6,72 @@ da calculadora HP-12C, incluindo a pilha RPN, o registro de entrada e as
 operações matemáticas e financeiras.
 """
 
-from decimal import Decimal, getcontext
+from decimal import Decimal, InvalidOperation, getcontext, localcontext
 import math
+from collections import deque
 import datetime
+import logging
+from functools import lru_cache
 import constants as c
-from typing import List, Dict, Optional, Callable, Any
+from typing import List, Dict, Deque, FrozenSet, Optional, Callable, Any
+
+logger = logging.getLogger(__name__)
+
+# Configura a precisão para as operações com Decimal (o visor mostra no máximo 10 dígitos)
+getcontext().prec = 15
+
+def _tvm(rate: float, n: float, pv: float, pmt: float, fv: float) -> float:
+    """Equação TVM (Time Value of Money) que queremos zerar."""
+    if rate == 0:
+        return pv + pmt * n + fv
+    # expm1/log1p evitam o cancelamento em (1+i)^n - 1 para taxas próximas de zero
+    opn_minus_1: float = math.expm1(n * math.log1p(rate))
+    return pv * (opn_minus_1 + 1) + pmt * opn_minus_1 / rate + fv
+
+def _tvm_deriv(rate: float, n: float, pv: float, pmt: float, fv: float) -> float:
+    """Derivada da equação TVM em relação à taxa."""
+    if abs(rate) < 1e-6: # Usa o limite em i = 0 para evitar cancelamento
+        return pv * n + pmt * n * (n - 1) / 2
+    opn1: float = (1 + rate) ** (n - 1)
+    opn: float = opn1 * (1 + rate)
+    return pv * n * opn1 + pmt * (n * opn1 * rate - (opn - 1)) / (rate * rate)
+
+def _bisect_for_i(n: float, pv: float, pmt: float, fv: float) -> Decimal:
+    """Resolve a equação TVM por bisseção, usada quando Newton não converge."""
+    low: float = -0.9999
+    high: float = math.expm1(min(math.log(11), 700 / n)) # Até 10, com (1+i)^n abaixo do overflow do float
+    try:
+        f_low: float = _tvm(low, n, pv, pmt, fv)
+        f_high: float = _tvm(high, n, pv, pmt, fv)
+        if f_low * f_high > 0: return Decimal('nan') # Sem troca de sinal no intervalo
+
+        for _ in range(200):
+            mid: float = (low + high) / 2
+            f_mid: float = _tvm(mid, n, pv, pmt, fv)
+            if abs(f_mid) < 1e-10 or (high - low) < 1e-15:
+                return Decimal(repr(mid))
+            if f_low * f_mid < 0:
+                high = mid
+            else:
+                low, f_low = mid, f_mid
+    except (OverflowError, ValueError):
+        pass
 
-# Configura a precisão para as operações com Decimal
-getcontext().prec = 28
+    return Decimal('nan') # Não convergiu
 
 class Calculator:
     """
     A classe Calculator simula o funcionamento interno de uma HP-12C.
     """
+    # Mapeia a tecla principal para suas funções f e g (constante, montado uma vez)
+    f_map: Dict[str, Optional[str]] = {main: f for main, f in zip(c.MAINS, c.FS) if f}
+    g_map: Dict[str, Optional[str]] = {main: g for main, g in zip(c.MAINS, c.GS) if g}
+
     # Atributos da classe com type hints
-    f_map: Dict[str, Optional[str]]
-    g_map: Dict[str, Optional[str]]
     storage_regs: List[Decimal]
     fin_regs: Dict[str, Decimal]
     stat_regs: Dict[str, Decimal]
-    stack: List[Decimal]
+    stack: Deque[Decimal]
     entry_buffer: str
     is_entering: bool
     f_active: bool
@@ -35,103 +81,126 @@ class Calculator:
     display_decimals: int
     is_entering_exponent: bool
     exponent_buffer: str
+    _dispatch: Dict[str, Callable[..., None]]
+    _needs_arg: FrozenSet[str]
+
+    # Constantes Decimal reutilizadas, evitando reconstruí-las a cada operação
+    _D0: Decimal = Decimal(0)
+    _D1: Decimal = Decimal(1)
+    _D2: Decimal = Decimal(2)
+    _D100: Decimal = Decimal(100)
+    _D001: Decimal = Decimal('0.01') # Recíproco de 100: multiplicar é mais barato que dividir
+    _DNAN: Decimal = Decimal('nan')
+    _PREC_FIN: int = 34 # Precisão usada nos cálculos financeiros e estatísticos
+    _DATE_QUANTUM: Decimal = Decimal('0.000001') # Resolução do formato DD.MMAAAA
+    _DATE_MIN_YEAR: int = 1582 # Faixa de datas aceita pela HP-12C
+    _DATE_MAX_YEAR: int = 4046
+
+    # Teclas com atalho direto em press_key
+    _DIGIT_KEYS: FrozenSet[str] = frozenset('0123456789,')
+    _OPS: FrozenSet[str] = frozenset({'+', '-', '×', '÷'})
+
+    # Tabela para trocar ',' <-> '.' na saída de format()
+    _SWAP: Dict[int, str] = str.maketrans({',': '.', '.': ','})
 
     def __init__(self) -> None:
         """
         Inicializa a calculadora, a pilha RPN, o estado de entrada e os mapas de função.
         """
-        # Mapeia a tecla principal para suas funções f e g
-        self.f_map = {b['main']: b['f'] for b in c.BOTOES if b.get('f')}
-        self.g_map = {b['main']: b['g'] for b in c.BOTOES if b.get('g')}
-
         # Registradores de Armazenamento (0-9)
-        self.storage_regs = [Decimal(0)] * 10
+        self.storage_regs = [self._D0] * 10
 
         # Registradores Financeiros
         self.fin_regs = {
-            'n': Decimal(0),
-            'i': Decimal(0),
-            'PV': Decimal(0),
-            'PMT': Decimal(0),
-            'FV': Decimal(0),
+            'n': self._D0,
+            'i': self._D0,
+            'PV': self._D0,
+            'PMT': self._D0,
+            'FV': self._D0,
         }
 
         # Registradores Estatísticos
         self.stat_regs = {
-            'n': Decimal(0),
-            'Σx': Decimal(0),
-            'Σx²': Decimal(0),
-            'Σy': Decimal(0),
-            'Σy²': Decimal(0),
-            'Σxy': Decimal(0),
+            'n': self._D0,
+            'Σx': self._D0,
+            'Σx²': self._D0,
+            'Σy': self._D0,
+            'Σy²': self._D0,
+            'Σxy': self._D0,
+        }
+
+        # Tabela de despacho: nome da função -> método de tratamento
+        self._dispatch = {
+            '0': self._handle_digit, '1': self._handle_digit, '2': self._handle_digit,
+            '3': self._handle_digit, '4': self._handle_digit, '5': self._handle_digit,
+            '6': self._handle_digit, '7': self._handle_digit, '8': self._handle_digit,
+            '9': self._handle_digit, ',': self._handle_digit,
+            'ENTER': self._handle_enter,
+            '+': self._handle_operator, '-': self._handle_operator,
+            '×': self._handle_operator, '÷': self._handle_operator,
+            'CHS': self._handle_chs,
+            'ON': self._reset,
+            'f': self._activate_f,
+            'g': self._activate_g,
+            'CLx': self._handle_clx,
+            'x<>y': self._handle_swap_xy,
+            'R↓': self._handle_roll_down,
+            'y^x': self._handle_power,
+            '1/x': self._handle_reciprocal,
+            '√x': self._handle_sqrt,
+            '%': self._handle_percent,
+            'Δ%': self._handle_percent_delta,
+            'STO': self._activate_sto,
+            'RCL': self._activate_rcl,
+            'Σ+': self._handle_sigma_plus,
+            'CLΣ': self._handle_clear_sigma,
+            'x̄': self._handle_mean,
+            's': self._handle_std_dev,
+            'SL': self._handle_sl_depreciation,
+            'SOYD': self._handle_soyd_depreciation,
+            'DB': self._handle_db_depreciation,
+            'EEX': self._handle_eex,
+            'ΔDYS': self._handle_delta_days,
+            'DATE': self._handle_date_calc,
+            'n': self._handle_fin_op, 'i': self._handle_fin_op, 'PV': self._handle_fin_op,
+            'PMT': self._handle_fin_op, 'FV': self._handle_fin_op,
         }
+        # Funções cujo método recebe o próprio nome como argumento
+        self._needs_arg = frozenset(
+            ['+', '-', '×', '÷', ','] + [str(d) for d in range(10)] + list(self.fin_regs)
+        )
 
         self._reset()
     def _format_number(self, number: Decimal, decimals: int) -> str:
         """Formata um número com separadores de milhares e casas decimais."""
+        return self._format_number_cached(str(number), decimals)
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _format_number_cached(num_str: str, decimals: int) -> str:
+        """
+        Versão memorizada de `_format_number`, indexada pela string do Decimal.
+
+        O display é redesenhado a cada quadro com o mesmo valor, então a
+        formatação só é refeita quando o número ou as casas decimais mudam.
+        """
+        number = Decimal(num_str)
         if number.is_nan():
             return "Error"
 
-        # Formata o número com as casas decimais corretas
-        formatted_str = f"{number:.{decimals}f}"
-        
-        # Separa a parte inteira da parte decimal
-        if '.' in formatted_str:
-            integer_part, decimal_part = formatted_str.split('.')
-        else:
-            integer_part, decimal_part = formatted_str, None
-
-        # Adiciona separadores de milhares à parte inteira
-        sign = ''
-        if integer_part.startswith('-'):
-            sign = '-'
-            integer_part = integer_part[1:]
-            
-        if len(integer_part) > 3:
-            # Inverte a string para facilitar a inserção dos pontos
-            reversed_integer = integer_part[::-1]
-            # Insere um ponto a cada 3 dígitos
-            with_separators = '.'.join(reversed_integer[i:i+3] for i in range(0, len(reversed_integer), 3))
-            # Desinverte para obter o formato correto
-            integer_part = with_separators[::-1]
-
-        # Remonta o número formatado
-        if decimal_part is not None:
-            return f"{sign}{integer_part},{decimal_part}"
-        else:
-            return f"{sign}{integer_part}"
+        # O format agrupa os milhares com ',' e usa '.' como decimal; o padrão brasileiro inverte os dois
+        return format(number, f',.{decimals}f').translate(Calculator._SWAP)
 
     def _format_entry_buffer(self) -> str:
         """Formata o buffer de entrada com separadores de milhares."""
         if self.entry_buffer == "Error":
             return self.entry_buffer
 
-        # O buffer interno e a exibição usam vírgula
-        if ',' in self.entry_buffer:
-            integer_part, decimal_part = self.entry_buffer.split(',', 1)
-        else:
-            integer_part, decimal_part = self.entry_buffer, None
-
-        sign = ''
-        if integer_part.startswith('-'):
-            sign = '-'
-            integer_part = integer_part[1:]
-        
-        # Adiciona separador de milhar na parte inteira
-        if len(integer_part) > 3:
-            reversed_integer = integer_part[::-1]
-            with_separators = '.'.join(reversed_integer[i:i+3] for i in range(0, len(reversed_integer), 3))
-            integer_part = with_separators[::-1]
-        
-        # Remonta a string para exibição
-        if decimal_part is not None:
-            return f"{sign}{integer_part},{decimal_part}"
-        
-        # Se o usuário acabou de digitar a vírgula
-        if self.entry_buffer.endswith(','):
-            return f"{sign}{integer_part},"
-
-        return f"{sign}{integer_part}"
+        # O buffer interno e a exibição usam vírgula; partition preserva uma vírgula final
+        integer_part, comma, decimal_part = self.entry_buffer.partition(',')
+        sign = '-' if integer_part.startswith('-') else ''
+        body = f"{int(integer_part[len(sign):] or '0'):,}".translate(self._SWAP)
+        return f"{sign}{body}{comma}{decimal_part}"
 
     def get_display(self) -> str:
         """
@@ -162,6 +231,18 @@ class Calculator:
         self.sto_active = False
         self.rcl_active = False
 
+        # Atalho para as teclas mais comuns quando não há modificador ativo
+        if not self.f_active and not self.g_active:
+            if key in self._DIGIT_KEYS:
+                self._handle_digit(key)
+                return
+            if key in self._OPS:
+                self._handle_operator(key)
+                return
+            if key == 'ENTER':
+                self._handle_enter()
+                return
+
         if self.f_active:
             # Tratamento especial para definir formato do display (f + dígito)
             if key.isdigit() and len(key) == 1:
@@ -188,55 +269,19 @@ class Calculator:
         """
         if not func_name: return
 
-        method_map = {
-            '0': self._handle_digit, '1': self._handle_digit, '2': self._handle_digit,
-            '3': self._handle_digit, '4': self._handle_digit, '5': self._handle_digit,
-            '6': self._handle_digit, '7': self._handle_digit, '8': self._handle_digit,
-            '9': self._handle_digit, ',': self._handle_digit,
-            'ENTER': self._handle_enter,
-            '+': self._handle_operator, '-': self._handle_operator,
-            '×': self._handle_operator, '÷': self._handle_operator,
-            'CHS': self._handle_chs,
-            'ON': self._reset,
-            'f': self._activate_f,
-            'g': self._activate_g,
-            'CLx': self._handle_clx,
-            'x<>y': self._handle_swap_xy,
-            'R↓': self._handle_roll_down,
-            'y^x': self._handle_power,
-            '1/x': self._handle_reciprocal,
-            '√x': self._handle_sqrt,
-            '%': self._handle_percent,
-            'Δ%': self._handle_percent_delta,
-            'STO': self._activate_sto,
-            'RCL': self._activate_rcl,
-            'Σ+': self._handle_sigma_plus,
-            'CLΣ': self._handle_clear_sigma,
-            'x̄': self._handle_mean,
-            's': self._handle_std_dev,
-            'SL': self._handle_sl_depreciation,
-            'SOYD': self._handle_soyd_depreciation,
-            'DB': self._handle_db_depreciation,
-            'EEX': self._handle_eex,
-            'ΔDYS': self._handle_delta_days,
-            'DATE': self._handle_date_calc,
-            'n': self._handle_fin_op, 'i': self._handle_fin_op, 'PV': self._handle_fin_op,
-            'PMT': self._handle_fin_op, 'FV': self._handle_fin_op,
-        }
-        
-        method = method_map.get(func_name)
+        method: Optional[Callable[..., None]] = self._dispatch.get(func_name)
         if method:
             # Passa o nome da função para métodos que tratam múltiplos casos
-            if func_name in ['+', '-', '×', '÷'] or func_name.isdigit() or func_name == ',' or func_name in self.fin_regs:
+            if func_name in self._needs_arg:
                 method(func_name)
             else:
                 method()
         else:
-            print(f"Função '{func_name}' não implementada.")
+            logger.debug("Função '%s' não implementada.", func_name)
 
     # --- MÉTODOS DE ESTADO E MODIFICADORES ---
     def _reset(self) -> None:
-        self.stack = [Decimal(0)] * 4
+        self.stack = deque([self._D0] * 4, maxlen=4)
         self.entry_buffer = "0"
         self.is_entering = False
         self.f_active = False
@@ -248,7 +293,7 @@ class Calculator:
         self.exponent_buffer = ''
         # Limpa também os registros estatísticos
         for key in self.stat_regs:
-            self.stat_regs[key] = Decimal(0)
+            self.stat_regs[key] = self._D0
 
     def _activate_f(self) -> None:
         self.f_active = True
@@ -278,48 +323,47 @@ class Calculator:
             self.display_decimals = num_decimals
 
     def _finalize_entry(self) -> None:
-        if self.is_entering:
-            if not self.entry_buffer or self.entry_buffer == '-':
-                self.is_entering = False
-                return
+        if not self.is_entering: return
 
-            # Substitui a vírgula do buffer por um ponto para o construtor Decimal
-            entry_str_for_decimal = self.entry_buffer.replace(',', '.')
-
-            full_number_str = entry_str_for_decimal
-            if self.is_entering_exponent:
-                if self.exponent_buffer:
-                    full_number_str += 'e' + self.exponent_buffer
-                else:
-                    full_number_str += 'e0'
-
-            try:
-                # Se o buffer terminar com um ponto (após a substituição da vírgula), remove-o
-                if full_number_str.endswith('.'):
-                    full_number_str = full_number_str[:-1]
-                
-                value = Decimal(full_number_str)
-                self._push_stack(value)
-            except Exception as e:
-                print(f"Erro ao finalizar entrada: {e}")
-                self.stack[0] = Decimal('nan')
-            
+        entry_str = self.entry_buffer
+        if not entry_str or entry_str == '-':
             self.is_entering = False
-            self.is_entering_exponent = False
-            self.exponent_buffer = ''
+            return
+
+        # Substitui a vírgula do buffer por um ponto para o construtor Decimal
+        if ',' in entry_str:
+            entry_str = entry_str.replace(',', '.')
+            # Se o buffer terminar com um ponto (após a substituição da vírgula), remove-o
+            if entry_str.endswith('.'):
+                entry_str = entry_str[:-1]
+
+        if self.is_entering_exponent:
+            entry_str += 'e' + (self.exponent_buffer or '0')
+
+        try:
+            value = Decimal(entry_str)
+            self._push_stack(value)
+        except Exception as e:
+            logger.warning("Erro ao finalizar entrada: %s", e)
+            self.stack[0] = self._DNAN
+
+        self.is_entering = False
+        self.is_entering_exponent = False
+        self.exponent_buffer = ''
 
     # --- MÉTODOS DE MANIPULAÇÃO DA PILHA ---
     def _push_stack(self, value: Decimal) -> None:
-        self.stack = [value] + self.stack[:-1]
+        self.stack.appendleft(value) # maxlen descarta o antigo T
 
     def _pop_stack(self) -> Decimal:
         x: Decimal = self.stack[0]
-        self.stack = self.stack[1:] + [self.stack[-1]]
+        self.stack.rotate(-1)
+        self.stack[-1] = self.stack[-2] # T é replicado, como na HP-12C
         return x
 
     def _handle_roll_down(self) -> None:
         self._finalize_entry()
-        self.stack = self.stack[1:] + self.stack[:1]
+        self.stack.rotate(-1)
 
     def _handle_swap_xy(self) -> None:
         self._finalize_entry()
@@ -331,7 +375,7 @@ class Calculator:
         self._finalize_entry()
         if 0 <= reg_idx < len(self.storage_regs):
             self.storage_regs[reg_idx] = self.stack[0]
-            print(f"Valor {self.stack[0]} armazenado no registro {reg_idx}")
+            logger.debug("Valor %s armazenado no registro %s", self.stack[0], reg_idx)
 
     def _handle_rcl(self, reg_idx: int) -> None:
         """Recupera um valor do registro de memória e o empurra para a pilha."""
@@ -339,7 +383,7 @@ class Calculator:
         if 0 <= reg_idx < len(self.storage_regs):
             value: Decimal = self.storage_regs[reg_idx]
             self._push_stack(value)
-            print(f"Valor {value} recuperado do registro {reg_idx}")
+            logger.debug("Valor %s recuperado do registro %s", value, reg_idx)
 
     # --- MÉTODOS DE ENTRADA E OPERAÇÕES BÁSICAS ---
     def _handle_digit(self, digit: str) -> None:
@@ -368,7 +412,7 @@ class Calculator:
             self.entry_buffer = "0"
             self.is_entering = False
         else:
-            self.stack[0] = Decimal(0)
+            self.stack[0] = self._D0
 
     def _handle_chs(self) -> None:
         if self.is_entering:
@@ -393,12 +437,12 @@ class Calculator:
         self._finalize_entry()
         x: Decimal = self._pop_stack()
         y: Decimal = self._pop_stack()
-        result: Decimal = Decimal(0)
+        result: Decimal = self._D0
         if op == '+': result = y + x
         elif op == '-': result = y - x
         elif op == '×': result = y * x
         elif op == '÷':
-            if x == 0: self.stack[0] = Decimal('nan'); return
+            if x == 0: self.stack[0] = self._DNAN; return
             result = y / x
         self._push_stack(result)
 
@@ -411,7 +455,7 @@ class Calculator:
         try:
             result: Decimal = y ** x
         except:
-            result = Decimal('nan')
+            result = self._DNAN
         self._push_stack(result)
 
     def _handle_reciprocal(self) -> None:
@@ -419,16 +463,16 @@ class Calculator:
         self._finalize_entry()
         x: Decimal = self.stack[0]
         if x == 0:
-            self.stack[0] = Decimal('nan')
+            self.stack[0] = self._DNAN
             return
-        self.stack[0] = 1 / x
+        self.stack[0] = self._D1 / x
 
     def _handle_sqrt(self) -> None:
         """Calcula a raiz quadrada de x."""
         self._finalize_entry()
         x: Decimal = self.stack[0]
         if x < 0:
-            self.stack[0] = Decimal('nan')
+            self.stack[0] = self._DNAN
             return
         self.stack[0] = x.sqrt()
 
@@ -437,7 +481,7 @@ class Calculator:
         self._finalize_entry()
         x: Decimal = self._pop_stack()
         y: Decimal = self._pop_stack()
-        result: Decimal = y * (x / 100)
+        result: Decimal = y * (x * self._D001)
         self._push_stack(result)
 
     def _handle_percent_delta(self) -> None:
@@ -446,17 +490,17 @@ class Calculator:
         x: Decimal = self._pop_stack()
         y: Decimal = self._pop_stack()
         if y == 0:
-            self.stack[0] = Decimal('nan')
+            self.stack[0] = self._DNAN
             return
-        result: Decimal = ((x - y) / y) * 100
+        result: Decimal = ((x - y) / y) * self._D100
         self._push_stack(result)
 
     # --- FUNÇÕES ESTATÍSTICAS ---
     def _handle_clear_sigma(self) -> None:
         """Limpa todos os registros estatísticos."""
         for key in self.stat_regs:
-            self.stat_regs[key] = Decimal(0)
-        print("Registros estatísticos limpos.")
+            self.stat_regs[key] = self._D0
+        logger.debug("Registros estatísticos limpos.")
 
     def _handle_sigma_plus(self) -> None:
         """Adiciona os valores de x e y aos somatórios estatísticos."""
@@ -464,21 +508,26 @@ class Calculator:
         x: Decimal = self.stack[0]
         y: Decimal = self.stack[1]
 
-        self.stat_regs['n'] += 1
-        self.stat_regs['Σx'] += x
-        self.stat_regs['Σx²'] += x**2
-        self.stat_regs['Σy'] += y
-        self.stat_regs['Σy²'] += y**2
-        self.stat_regs['Σxy'] += x * y
+        # Somatórios em precisão estendida: o desvio padrão subtrai Σx² e (Σx)²/n,
+        # e qualquer arredondamento aqui reaparece amplificado nessa diferença
+        regs = self.stat_regs
+        with localcontext() as ctx:
+            ctx.prec = self._PREC_FIN
+            regs['n'] += 1
+            regs['Σx'] += x
+            regs['Σx²'] += x * x
+            regs['Σy'] += y
+            regs['Σy²'] += y * y
+            regs['Σxy'] += x * y
 
         # Após Σ+, o visor mostra o novo n
-        self._push_stack(self.stat_regs['n'])
+        self._push_stack(regs['n'])
 
     def _handle_mean(self) -> None:
         """Calcula a média de x (x̄)."""
         n: Decimal = self.stat_regs['n']
         if n == 0:
-            self.stack[0] = Decimal('nan')
+            self.stack[0] = self._DNAN
             return
         mean_x: Decimal = self.stat_regs['Σx'] / n
         self._push_stack(mean_x)
@@ -487,64 +536,65 @@ class Calculator:
         """Calcula o desvio padrão amostral de x (s)."""
         n: Decimal = self.stat_regs['n']
         if n < 2:
-            self.stack[0] = Decimal('nan')
+            self.stack[0] = self._DNAN
             return
         
         sum_x: Decimal = self.stat_regs['Σx']
         sum_x_sq: Decimal = self.stat_regs['Σx²']
         
-        # Fórmula: sqrt( (n * Σx² - (Σx)²) / (n * (n-1)) )
+        # Fórmula: sqrt( (Σx² - (Σx)²/n) / (n-1) )
         try:
-            numerator: Decimal = n * sum_x_sq - sum_x**2
-            denominator: Decimal = n * (n - 1)
-            if denominator == 0: self.stack[0] = Decimal('nan'); return
-            
-            variance: Decimal = numerator / denominator
-            if variance < 0: self.stack[0] = Decimal('nan'); return
-
-            std_dev: Decimal = variance.sqrt()
-            self._push_stack(std_dev)
+            with localcontext() as ctx:
+                ctx.prec = self._PREC_FIN
+                variance: Decimal = (sum_x_sq - sum_x * sum_x / n) / (n - 1)
+                # Só o arredondamento pode deixar a variância negativa; o valor real é 0
+                if variance < 0: variance = self._D0
+
+                std_dev: Decimal = variance.sqrt()
+                self._push_stack(std_dev)
         except:
-            self.stack[0] = Decimal('nan')
+            self.stack[0] = self._DNAN
 
 
     # --- FUNÇÕES DE DATA ---
     def _parse_date_number(self, date_num: Decimal) -> Optional[datetime.date]:
         """Converte um número no formato DD.MMYYYY para um objeto datetime.date."""
+        return self._parse_date_str(str(date_num))
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _parse_date_str(date_str: str) -> Optional[datetime.date]:
+        """
+        Versão memorizada de `_parse_date_number`, indexada pela string do Decimal.
+
+        Operações de data sucessivas costumam reutilizar as mesmas datas em Y e X.
+        """
         try:
-            # Remove separadores de milhar e converte separador decimal para formato interno
-            date_str = str(date_num).replace('.', '').replace(',', '.')
-            
-            # Se o número for um inteiro, pode não ter parte decimal
-            if '.' in date_str:
-                day_month_year = date_str.split('.')
-                day = int(day_month_year[0])
-                # A lógica para extrair mês e ano precisa ser robusta
-                if len(day_month_year[1]) == 4: # Formato MMYY
-                    month = int(day_month_year[1][:2])
-                    year = int(day_month_year[1][2:])
-                elif len(day_month_year[1]) >= 5: # Formato MMDDDDAAAA
-                    month = int(day_month_year[1][:2])
-                    year = int(day_month_year[1][2:6])
-                else:
-                    raise ValueError("Formato de data inválido")
-            else: # Formato DDMMAAAA
-                date_str = str(int(date_num))
-                day = int(date_str[:2])
-                month = int(date_str[2:4])
-                year = int(date_str[4:])
-
-            # Ajuste para anos de 2 dígitos (ex: 79 -> 1979)
-            if year < 100:
+            date_num = Decimal(date_str)
+            if date_num == date_num.to_integral_value(): # Formato DDMMAAAA
+                date_int = int(date_num)
+            else: # Formato DD.MMAAAA: desloca as seis casas decimais para a parte inteira
+                date_int = int(date_num.quantize(Calculator._DATE_QUANTUM) * 1000000)
+
+            # Extrai dia, mês e ano aritmeticamente, sem passar por strings
+            if date_int < 1000000: # Formato DDMMAA: ano de 2 dígitos (ex: 79 -> 1979)
+                date_int, year = divmod(date_int, 100)
                 year += 1900
+            else:
+                date_int, year = divmod(date_int, 10000)
+            day, month = divmod(date_int, 100)
+
+            # Fora da faixa da HP-12C (ex.: DD.MMAA lido como ano 7900) é erro, não uma data distante
+            if not Calculator._DATE_MIN_YEAR <= year <= Calculator._DATE_MAX_YEAR:
+                return None
 
             return datetime.date(year, month, day)
-        except (ValueError, IndexError):
+        except (ValueError, OverflowError, InvalidOperation):
             return None
 
     def _format_date_to_number(self, date_obj: datetime.date) -> Decimal:
         """Converte um objeto datetime.date para um número no formato DD,MMYYYY."""
-        if not date_obj: return Decimal('nan')
+        if not date_obj: return self._DNAN
         # O formato para Decimal deve usar ponto
         return Decimal(f"{date_obj.day:02d}.{date_obj.month:02d}{date_obj.year}")
 
@@ -558,7 +608,7 @@ class Calculator:
         date1: Optional[datetime.date] = self._parse_date_number(date1_num)
 
         if not date1 or not date2:
-            self.stack[0] = Decimal('nan')
+            self.stack[0] = self._DNAN
             return
         
         delta: datetime.timedelta = date2 - date1
@@ -573,14 +623,14 @@ class Calculator:
         start_date: Optional[datetime.date] = self._parse_date_number(start_date_num)
 
         if not start_date:
-            self.stack[0] = Decimal('nan')
+            self.stack[0] = self._DNAN
             return
         
         try:
-            result_date: datetime.date = start_date + datetime.timedelta(days=int(days_to_add))
+            result_date: datetime.date = datetime.date.fromordinal(start_date.toordinal() + int(days_to_add))
             self._push_stack(self._format_date_to_number(result_date))
-        except OverflowError:
-            self.stack[0] = Decimal('nan') # Data fora do range suportado
+        except (OverflowError, ValueError):
+            self.stack[0] = self._DNAN # Data fora do range suportado
             return
 
     # --- FUNÇÕES DE DEPRECIAÇÃO ---
@@ -591,7 +641,7 @@ class Calculator:
         salvage_value: Decimal = self._pop_stack()
         cost: Decimal = self._pop_stack()
 
-        if life == 0: self.stack[0] = Decimal('nan'); return
+        if life == 0: self.stack[0] = self._DNAN; return
         
         depreciation: Decimal = (cost - salvage_value) / life
         self._push_stack(depreciation)
@@ -604,9 +654,9 @@ class Calculator:
         salvage_value: Decimal = self._pop_stack()
         cost: Decimal = self._pop_stack()
 
-        if life == 0 or period == 0 or period > life: self.stack[0] = Decimal('nan'); return
+        if life == 0 or period == 0 or period > life: self.stack[0] = self._DNAN; return
 
-        sum_of_years_digits: Decimal = life * (life + 1) / 2
+        sum_of_years_digits: Decimal = life * (life + 1) / self._D2
         remaining_life: Decimal = life - period + 1
         
         depreciation: Decimal = (cost - salvage_value) * (remaining_life / sum_of_years_digits)
@@ -621,22 +671,22 @@ class Calculator:
         salvage_value: Decimal = self._pop_stack()
         cost: Decimal = self._pop_stack()
 
-        if life == 0 or period == 0 or period > life: self.stack[0] = Decimal('nan'); return
-        if rate_percent <= 0: self.stack[0] = Decimal('nan'); return
+        if life == 0 or period == 0 or period > life: self.stack[0] = self._DNAN; return
+        if rate_percent <= 0: self.stack[0] = self._DNAN; return
 
-        depreciation_rate: Decimal = rate_percent / 100 / life
+        depreciation_rate: Decimal = rate_percent * self._D001 / life
         book_value: Decimal = cost
-        depreciation: Decimal = Decimal(0)
+        depreciation: Decimal = self._D0
 
-        for p in range(1, int(period) + 1):
+        for _ in range(int(period)):
             if book_value <= salvage_value: # Não deprecia abaixo do valor residual
-                depreciation = Decimal(0)
+                depreciation = self._D0
                 break
-            
+
             current_depreciation: Decimal = book_value * depreciation_rate
             if book_value - current_depreciation < salvage_value:
                 current_depreciation = book_value - salvage_value
-            
+
             book_value -= current_depreciation
             depreciation = current_depreciation # Apenas o último período é retornado
 
@@ -652,90 +702,85 @@ class Calculator:
         if was_entering:
             # Armazena o valor do registrador X no registrador financeiro
             self.fin_regs[key] = self.stack[0]
-            print(f"Armazenado {self.stack[0]} em {key}")
+            logger.debug("Armazenado %s em %s", self.stack[0], key)
         else:
-            # Calcula o valor para a tecla pressionada
-            n = self.fin_regs['n']
-            i = self.fin_regs['i'] / 100
-            pv = self.fin_regs['PV']
-            pmt = self.fin_regs['PMT']
-            fv = self.fin_regs['FV']
-
-            if key == 'FV':
-                if i == 0:
-                    result = - (pv + pmt * n)
-                else:
-                    result = - (pv * (1 + i)**n + pmt * (((1 + i)**n - 1) / i))
-            elif key == 'PV':
-                if i == 0:
-                    result = - (fv + pmt * n)
-                else:
-                    result = - (fv + pmt * (((1 + i)**n - 1) / i)) / (1 + i)**n
-            elif key == 'PMT':
-                if i == 0:
-                    if n == 0: self.stack[0] = Decimal('nan'); return
-                    result = - (pv + fv) / n
-                else:
-                    denominator = ((1 + i)**n - 1) / i
-                    if denominator == 0: self.stack[0] = Decimal('nan'); return
-                    result = - (pv * (1 + i)**n + fv) / denominator
-            elif key == 'n':
-                if i == 0:
-                    if pmt == 0: self.stack[0] = Decimal('nan'); return
-                    result = - (pv + fv) / pmt
-                else:
-                    # log( (PMT - FV*i) / (PV*i + PMT) ) / log(1+i)
-                    try:
-                        log_arg_num = pmt - fv * i
-                        log_arg_den = pv * i + pmt
-                        if log_arg_den == 0 or log_arg_num / log_arg_den <= 0:
-                            self.stack[0] = Decimal('nan'); return
+            # Os cálculos financeiros usam precisão maior para manter a estabilidade de (1+i)^n
+            with localcontext() as ctx:
+                ctx.prec = self._PREC_FIN
+                # Calcula o valor para a tecla pressionada
+                n = self.fin_regs['n']
+                i = self.fin_regs['i'] * self._D001
+                pv = self.fin_regs['PV']
+                pmt = self.fin_regs['PMT']
+                fv = self.fin_regs['FV']
+
+                if key in ('FV', 'PV', 'PMT'):
+                    # Calcula (1+i)^n e o fator de anuidade uma única vez por operação
+                    opi_n = (1 + i)**n if i != 0 else self._D1
+                    ann = (opi_n - 1) / i if i != 0 else n
+
+                if key == 'FV':
+                    result = - (pv * opi_n + pmt * ann)
+                elif key == 'PV':
+                    result = - (fv + pmt * ann) / opi_n
+                elif key == 'PMT':
+                    if ann == 0: self.stack[0] = self._DNAN; return
+                    result = - (pv * opi_n + fv) / ann
+                elif key == 'n':
+                    if i == 0:
+                        if pmt == 0: self.stack[0] = self._DNAN; return
+                        result = - (pv + fv) / pmt
+                    else:
+                        # log( (PMT - FV*i) / (PV*i + PMT) ) / log(1+i)
+                        try:
+                            log_arg_num = pmt - fv * i
+                            log_arg_den = pv * i + pmt
+                            if log_arg_den == 0 or log_arg_num / log_arg_den <= 0:
+                                self.stack[0] = self._DNAN; return
                         
-                        log_arg = log_arg_num / log_arg_den
-                        result = Decimal(math.log(log_arg)) / Decimal(math.log(1+i))
-                    except (ValueError, ZeroDivisionError):
-                        self.stack[0] = Decimal('nan'); return
-            elif key == 'i':
-                result = self._solve_for_i(n, pv, pmt, fv) * 100 # Converte para porcentagem
-            else:
-                print(f"Cálculo para '{key}' ainda não implementado.")
-                return
+                            log_arg = log_arg_num / log_arg_den
+                            result = Decimal(math.log(log_arg)) / Decimal(math.log(1+i))
+                        except (ValueError, ZeroDivisionError):
+                            self.stack[0] = self._DNAN; return
+                elif key == 'i':
+                    result = self._solve_for_i(n, pv, pmt, fv) * self._D100 # Converte para porcentagem
+                else:
+                    logger.debug("Cálculo para '%s' ainda não implementado.", key)
+                    return
             
-            self.fin_regs[key] = result
-            self.stack[0] = result
+                self.fin_regs[key] = result
+                self.stack[0] = result
 
     def _solve_for_i(self, n: Decimal, pv: Decimal, pmt: Decimal, fv: Decimal) -> Decimal:
         """
-        Usa um método numérico (método da Secante) para encontrar a taxa de juros i.
-        """
-        if n <= 0: return Decimal('nan')
+        Usa o método de Newton-Raphson (em float) para encontrar a taxa de juros i.
 
-        # Função TVM (Time Value of Money) que queremos zerar
-        def f(rate: Decimal) -> Decimal:
-            if rate == 0:
-                return pv + pmt * n + fv
-            else:
-                return pv * (1 + rate)**n + pmt * (1 + rate/12) * (((1 + rate)**n - 1) / rate) + fv
-
-        # Chutes iniciais e parâmetros do solucionador
-        i0: Decimal = Decimal('0.005')
-        i1: Decimal = Decimal('0.01')
-        max_iter: int = 100
-        tol: Decimal = Decimal('1e-9')
-
-        for _ in range(max_iter):
-            f0: Decimal = f(i0)
-            f1: Decimal = f(i1)
-            if abs(f1) < tol:
-                return i1
-            
-            if (f1 - f0) == 0: return Decimal('nan') # Divisão por zero
-            
-            i_next: Decimal = i1 - f1 * (i1 - i0) / (f1 - f0)
+        Se Newton divergir, recorre à bisseção no intervalo [-0.9999, 10].
+        """
+        if n <= 0: return self._DNAN
 
-            if abs(i_next - i1) < tol:
-                return i_next
+        fn, fpv, fpmt, ffv = float(n), float(pv), float(pmt), float(fv)
 
-            i0, i1 = i1, i_next
+        # Chute inicial e parâmetros do solucionador
+        rate: float = 0.01
+        max_iter: int = 30
+        tol: float = 1e-10
 
-        return Decimal('nan') # Não convergiu
+        try:
+            for _ in range(max_iter):
+                f: float = _tvm(rate, fn, fpv, fpmt, ffv)
+                if abs(f) < tol:
+                    return Decimal(repr(rate))
+
+                fprime: float = _tvm_deriv(rate, fn, fpv, fpmt, ffv)
+                if fprime == 0: break
+
+                step: float = f / fprime
+                rate -= step
+                if not -1 < rate < 1e6: break # Newton divergiu
+                if abs(step) < 1e-15:
+                    return Decimal(repr(rate))
+        except (OverflowError, ValueError, ZeroDivisionError):
+            pass
+
+        return _bisect_for_i(fn, fpv, fpmt, ffv)
@@ -1,13 +1,20 @@
 '''
 Módulo para armazenar constantes do projeto, como cores, dimensões e layout.
 '''
+import os
 import pygame
-from typing import List, Dict, Tuple, Any, Optional
+from typing import Dict, Tuple, Optional
 
 # Dimensões da janela
 LARGURA: int = 740
 ALTURA: int = 430 # Aumentado para acomodar a pilha
 
+# Fontes TTF distribuídas com o projeto (DejaVu), carregadas sem consultar o fontconfig
+DIR_FONTES: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fonts')
+FONTE_MONO: str = os.path.join(DIR_FONTES, 'DejaVuSansMono.ttf')
+FONTE_MONO_NEGRITO: str = os.path.join(DIR_FONTES, 'DejaVuSansMono-Bold.ttf')
+FONTE_SANS_NEGRITO: str = os.path.join(DIR_FONTES, 'DejaVuSans-Bold.ttf')
+
 # Cores (em formato RGB)
 COR_FUNDO: Tuple[int, int, int] = (20, 20, 20)
 COR_CORPO_CALCULADORA: Tuple[int, int, int] = (65, 60, 55)
@@ -29,8 +36,6 @@ ALTURA_CORPO: int = ALTURA - 2 * MARGEM_CORPO
 
 # Layout dos Botões
 # Posições e tamanhos definidos manualmente para maior fidelidade.
-BOTOES: List[Dict[str, Any]] = []
-
 BW: int = 68  # Largura padrão do botão
 BH: int = 38  # Altura padrão do botão
 BX_START: int = 18  # Posição inicial X do primeiro botão (canto sup esq do corpo)
@@ -45,53 +50,69 @@ ALTURA_TELA: int = 100 # Reintroduzido com o valor correto
 POS_X_TELA: int = MARGEM_CORPO + BX_START # Alinhado com o início dos botões
 POS_Y_TELA: int = MARGEM_CORPO + 70 # Ajustado para dar espaço à pilha
 
-# Definição dos botões (main, f, g, cor)
-LAYOUT: Dict[Tuple[int, int], Tuple[str, Optional[str], Optional[str], str]] = {
-    (0, 0): ('n', '12x', 'AMORT', 'preto'),
-    (0, 1): ('i', '12÷', 'INT', 'preto'),
-    (0, 2): ('PV', 'CF0', 'NPV', 'preto'),
-    (0, 3): ('PMT', 'CFj', 'IRR', 'preto'),
-    (0, 4): ('7', None, 'YTM', 'preto'),
-    (0, 5): ('8', 'SL', 'x̄', 'preto'),
-    (0, 6): ('9', 'SOYD', 's', 'preto'),
-    (0, 7): ('÷', None, 'DB', 'preto'),
-
-    (1, 0): ('FV', 'Nj', 'RND', 'preto'),
-    (1, 1): ('Δ%', 'FRAC', 'INTG', 'preto'),
-    (1, 2): ('1/x', '%', 'LN', 'preto'),
-    (1, 3): ('y^x', '√x', 'e^x', 'preto'),
-    (1, 4): ('4', None, None, 'preto'),
-    (1, 5): ('5', None, None, 'preto'),
-    (1, 6): ('6', None, None, 'preto'),
-    (1, 7): ('×', None, None, 'preto'),
-
-
-    (2, 0): ('R↓', 'x<>y', 'PSE', 'preto'),
-    (2, 1): ('SST', 'BST', 'GTO', 'preto'),
-    (2, 2): ('EEX', 'ΔDYS', 'R/S', 'preto'),
-    (2, 3): ('CHS', 'DATE', 'PRICE', 'preto'),
-    (2, 4): ('1', None, None, 'preto'),
-    (2, 5): ('2', None, None, 'preto'),
-    (2, 6): ('3', None, None, 'preto'),
-    (2, 7): ('-', None, None, 'preto'),
-
-    (3, 0): ('ON', None, None, 'preto'),
-    (3, 1): ('f', None, None, 'laranja'),
-    (3, 2): ('g', None, None, 'azul'),
-    (3, 3): ('STO', 'RCL', 'PREFIX', 'preto'),
-    (3, 4): ('0', None, None, 'preto'),
-    (3, 5): (',', None, None, 'preto'),
-    (3, 6): ('Σ+', 'CLΣ', 'MEM', 'preto'),
-    (3, 7): ('+', None, None, 'preto'),
+# Definição dos botões (linha, coluna, main, f, g, cor)
+LAYOUT: Tuple[Tuple[int, int, str, Optional[str], Optional[str], str], ...] = (
+    (0, 0, 'n', '12x', 'AMORT', 'preto'),
+    (0, 1, 'i', '12÷', 'INT', 'preto'),
+    (0, 2, 'PV', 'CF0', 'NPV', 'preto'),
+    (0, 3, 'PMT', 'CFj', 'IRR', 'preto'),
+    (0, 4, '7', None, 'YTM', 'preto'),
+    (0, 5, '8', 'SL', 'x̄', 'preto'),
+    (0, 6, '9', 'SOYD', 's', 'preto'),
+    (0, 7, '÷', None, 'DB', 'preto'),
+
+    (1, 0, 'FV', 'Nj', 'RND', 'preto'),
+    (1, 1, 'Δ%', 'FRAC', 'INTG', 'preto'),
+    (1, 2, '1/x', '%', 'LN', 'preto'),
+    (1, 3, 'y^x', '√x', 'e^x', 'preto'),
+    (1, 4, '4', None, None, 'preto'),
+    (1, 5, '5', None, None, 'preto'),
+    (1, 6, '6', None, None, 'preto'),
+    (1, 7, '×', None, None, 'preto'),
+
+
+    (2, 0, 'R↓', 'x<>y', 'PSE', 'preto'),
+    (2, 1, 'SST', 'BST', 'GTO', 'preto'),
+    (2, 2, 'EEX', 'ΔDYS', 'R/S', 'preto'),
+    (2, 3, 'CHS', 'DATE', 'PRICE', 'preto'),
+    (2, 4, '1', None, None, 'preto'),
+    (2, 5, '2', None, None, 'preto'),
+    (2, 6, '3', None, None, 'preto'),
+    (2, 7, '-', None, None, 'preto'),
+
+    (3, 0, 'ON', None, None, 'preto'),
+    (3, 1, 'f', None, None, 'laranja'),
+    (3, 2, 'g', None, None, 'azul'),
+    (3, 3, 'STO', 'RCL', 'PREFIX', 'preto'),
+    (3, 4, '0', None, None, 'preto'),
+    (3, 5, ',', None, None, 'preto'),
+    (3, 6, 'Σ+', 'CLΣ', 'MEM', 'preto'),
+    (3, 7, '+', None, None, 'preto'),
+)
+
+# Gerar os botões a partir do LAYOUT em grade, como tuplas paralelas (um índice por botão)
+# Os retângulos já incluem a margem do corpo, ficando em coordenadas de tela
+# O botão ENTER é especial e não se encaixa na grade principal
+RECT_ENTER: pygame.Rect = pygame.Rect(MARGEM_CORPO + BX_START + 8 * (BW + BSX), MARGEM_CORPO + BY_START + 0 * (BH + BSY), BW, BH*4.7 + BSY)
+RECTS: Tuple[pygame.Rect, ...] = tuple(
+    pygame.Rect(MARGEM_CORPO + BX_START + col * (BW + BSX), MARGEM_CORPO + BY_START + row * (BH + BSY), BW, BH)
+    for (row, col, main, f, g, color) in LAYOUT
+) + (RECT_ENTER,)
+MAINS: Tuple[str, ...] = tuple(main for (row, col, main, f, g, color) in LAYOUT) + ('ENTER',)
+FS: Tuple[Optional[str], ...] = tuple(f for (row, col, main, f, g, color) in LAYOUT) + ('INPUT',)
+GS: Tuple[Optional[str], ...] = tuple(g for (row, col, main, f, g, color) in LAYOUT) + ('FIN',)
+# As cores já são resolvidas para RGB aqui, evitando a consulta por nome ao desenhar
+CORES_BOTAO: Dict[str, Tuple[int, int, int]] = {
+    'preto': COR_BOTAO_PRETO,
+    'azul': COR_BOTAO_AZUL,
+    'laranja': COR_BOTAO_LARANJA,
 }
+COLORS: Tuple[Tuple[int, int, int], ...] = tuple(CORES_BOTAO[color] for (row, col, main, f, g, color) in LAYOUT) + (COR_BOTAO_PRETO,)
 
-# Gerar BOTOES a partir do LAYOUT em grade
-for (row, col), (main, f, g, color) in LAYOUT.items():
-    rect = pygame.Rect(BX_START + col * (BW + BSX), BY_START + row * (BH + BSY), BW, BH)
-    BOTOES.append({'rect': rect, 'main': main, 'f': f, 'g': g, 'color': color})
-
-# Botões especiais que não se encaixam na grade principal
-BOTOES.append({'rect': pygame.Rect(BX_START + 8 * (BW + BSX), BY_START + 0 * (BH + BSY), BW, BH*4.7 + BSY), 'main': 'ENTER', 'f': 'INPUT', 'g': 'FIN', 'color': 'preto'})
+# Busca de clique: posição (linha, coluna) na grade -> tecla principal
+GRADE_BOTOES: Dict[Tuple[int, int], str] = {(row, col): main for (row, col, main, f, g, color) in LAYOUT}
+# Botões fora da grade, testados retângulo a retângulo
+BOTOES_ESPECIAIS: Tuple[Tuple[pygame.Rect, str], ...] = ((RECT_ENTER, 'ENTER'),)
 
 
 # Mapeamento do teclado para ações da calculadora
@@ -109,6 +130,7 @@ KEY_MAP: Dict[int, str] = {
     pygame.K_PERIOD: ',', pygame.K_KP_PERIOD: ',', pygame.K_COMMA: ',',
     pygame.K_PLUS: '+', pygame.K_KP_PLUS: '+',
     pygame.K_MINUS: '-', pygame.K_KP_MINUS: '-',
+    pygame.K_KP_MULTIPLY: '×',
     pygame.K_SLASH: '÷', pygame.K_KP_DIVIDE: '÷',
     pygame.K_RETURN: 'ENTER', pygame.K_KP_ENTER: 'ENTER',
     pygame.K_BACKSPACE: 'CLx', # Mapeia backspace para limpar a entrada
@@ -18,15 +18,21 @@ def main() -> None:
     ui = UI(calculator) # Passa a instância da calculadora para a UI
 
     running = True
+    precisa_desenhar = True # Só consulta o display (get_display) depois de uma tecla processada
     while running:
-        for event in pygame.event.get():
+        # Bloqueia até chegar um evento (ou expirar o timeout), sem girar a CPU ociosa
+        eventos = [pygame.event.wait(100)] + pygame.event.get()
+        for event in eventos:
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.VIDEOEXPOSE:
+                pygame.display.flip() # Reapresenta a tela, já que só o visor é atualizado a cada quadro
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1: # Left click
                     key = ui.get_botao_clicado(event.pos)
                     if key:
                         calculator.press_key(key)
+                        precisa_desenhar = True
             elif event.type == pygame.KEYDOWN:
                 mods = pygame.key.get_mods()
                 key_char = None
@@ -41,9 +47,12 @@ def main() -> None:
 
                 if key_char:
                     calculator.press_key(key_char)
+                    precisa_desenhar = True
 
-        # Update UI
-        ui.desenha_tudo(calculator.f_active, calculator.g_active) # Não passa texto_tela aqui
+        # Update UI apenas se algo pode ter mudado; sem eventos, nada é recalculado
+        if precisa_desenhar:
+            ui.desenha_tudo(calculator.f_active, calculator.g_active) # Não passa texto_tela aqui
+            precisa_desenhar = False
 
     pygame.quit()
 
@@ -7,7 +7,7 @@ Ele utiliza a biblioteca Pygame para desenhar os elementos na tela.
 """
 import pygame
 import constants as c
-from typing import List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any
 
 class UI:
     """
@@ -18,22 +18,112 @@ class UI:
     font_botao_main: pygame.font.Font
     font_botao_sub: pygame.font.Font
     font_indicador: pygame.font.Font
-    botoes_rects: List[Tuple[pygame.Rect, str]]
+    _button_cache: List[Tuple[pygame.Rect, pygame.Surface, str]]
+    _last_state: Optional[Tuple[Any, ...]]
+    _area_visor: pygame.Rect
+    _glyph_cache: Dict[str, Tuple[pygame.Surface, int, int]]
+    _f_surf: pygame.Surface
+    _g_surf: pygame.Surface
+    _f_pos: Tuple[int, int]
+    _g_pos: Tuple[int, int]
+    _pilha_ancoras: Tuple[Tuple[int, int], ...]
+    _hit_regions: Tuple[Tuple[int, int, int, int, str], ...]
+    _last_stack: List[Optional[Tuple[str, int]]]
+    _stack_surfs: List[Optional[Tuple[pygame.Surface, Tuple[int, int]]]]
 
     def __init__(self, calculator) -> None:
         """
         Inicializa o Pygame, a tela e as fontes necessárias para a UI.
         """
         self.calculator = calculator # Referência à instância da calculadora
-        pygame.init()
+        # Inicializa apenas os subsistemas usados (vídeo/eventos e fontes), sem áudio ou joystick
+        pygame.display.init()
+        pygame.font.init()
         self.screen = pygame.display.set_mode((c.LARGURA, c.ALTURA))
         pygame.display.set_caption("HP-12C")
-        self.font_tela = pygame.font.SysFont('monospace', 36, bold=True)
-        self.font_stack_small = pygame.font.SysFont('monospace', 20) # Fonte menor para a pilha
-        self.font_botao_main = pygame.font.SysFont('sans-serif', 20, bold=True)
-        self.font_botao_sub = pygame.font.SysFont('sans-serif', 10, bold=True)
-        self.font_indicador = pygame.font.SysFont('monospace', 14, bold=True)
-        self.botoes_rects = [] # Armazenará tuplas (rect, main_text)
+        self.font_tela = pygame.font.Font(c.FONTE_MONO_NEGRITO, 36)
+        self.font_stack_small = pygame.font.Font(c.FONTE_MONO, 20) # Fonte menor para a pilha
+        self.font_botao_main = pygame.font.Font(c.FONTE_SANS_NEGRITO, 20)
+        self.font_botao_sub = pygame.font.Font(c.FONTE_SANS_NEGRITO, 10)
+        self.font_indicador = pygame.font.Font(c.FONTE_MONO_NEGRITO, 14)
+        self._button_cache = []
+        self._monta_cache_botoes()
+
+        # Botões fora da grade como (x1, y1, x2, y2, ação), testados sem chamar Rect.collidepoint
+        self._hit_regions = tuple(
+            (rect.left, rect.top, rect.right, rect.bottom, acao) for rect, acao in c.BOTOES_ESPECIAIS
+        )
+
+        # Cache de glifos do visor: caractere -> (superfície, largura, y do topo)
+        self._glyph_cache = {}
+        for ch in "0123456789.,-E ":
+            self._glyph(ch)
+
+        # Indicadores 'f' e 'g' pré-renderizados, com as posições de blit já calculadas
+        self._f_surf = self.font_indicador.render('f', True, c.COR_TEXTO_TELA).convert_alpha()
+        self._f_pos = self._f_surf.get_rect(bottomleft=(c.POS_X_TELA + 10, c.POS_Y_TELA + c.ALTURA_TELA - 5)).topleft
+        self._g_surf = self.font_indicador.render('g', True, c.COR_TEXTO_TELA).convert_alpha()
+        self._g_pos = self._g_surf.get_rect(bottomleft=(c.POS_X_TELA + 25, c.POS_Y_TELA + c.ALTURA_TELA - 5)).topleft
+
+        # Âncoras (direita, topo) de cada linha da pilha Y, Z, T, relativas ao display principal
+        # A pilha é desenhada de baixo para cima (Y, Z, T)
+        # O valor 'Y' (stack[1]) será o mais próximo do display principal
+        base_y_pos: int = c.POS_Y_TELA + 55 # Posição Y para o centro do texto 'Y'
+        line_height: int = 20 # Altura aproximada de uma linha de texto da pilha
+        altura_pilha: int = self.font_stack_small.get_height()
+        self._pilha_ancoras = tuple(
+            (c.POS_X_TELA + c.LARGURA_TELA - 15, base_y_pos - i * line_height - altura_pilha // 2)
+            for i in range(3)
+        )
+
+        # Superfícies e posições já renderizadas de cada linha da pilha, com o
+        # (str do valor, casas decimais) que as gerou; só a linha que mudou é re-renderizada
+        self._last_stack = [None] * 3
+        self._stack_surfs = [None] * 3
+
+        # Estado do último quadro desenhado; None força o desenho completo inicial
+        self._last_state = None
+
+        # Área redesenhada a cada mudança: o visor mais a faixa do texto principal,
+        # que ultrapassa um pouco a borda inferior do visor
+        altura_texto: int = self.font_tela.get_height()
+        self._area_visor = pygame.Rect(c.POS_X_TELA, c.POS_Y_TELA, c.LARGURA_TELA, c.ALTURA_TELA).union(
+            pygame.Rect(c.POS_X_TELA, c.POS_Y_TELA + 35 + c.ALTURA_TELA // 2 - altura_texto // 2 - 1,
+                        c.LARGURA_TELA, altura_texto + 2))
+
+    def _monta_cache_botoes(self) -> None:
+        """
+        Pré-renderiza cada botão (fundo e textos main/f/g) em sua própria superfície.
+
+        O conteúdo dos botões é estático, então ele é desenhado uma única vez aqui
+        e `_desenha_botoes` apenas faz o blit das superfícies prontas.
+        """
+        for rect, main_text, f_text, g_text, color in zip(c.RECTS, c.MAINS, c.FS, c.GS, c.COLORS):
+            # Superfície opaca: os cantos arredondados recebem a cor do corpo, sobre o qual o botão fica
+            surf: pygame.Surface = pygame.Surface(rect.size)
+            surf.fill(c.COR_CORPO_CALCULADORA)
+            area: pygame.Rect = surf.get_rect()
+            pygame.draw.rect(surf, color, area, border_radius=5)
+
+            # Desenha texto principal
+            if main_text:
+                texto_surf: pygame.Surface = self.font_botao_main.render(main_text, True, c.COR_TEXTO_BOTAO_BRANCO)
+                surf.blit(texto_surf, texto_surf.get_rect(center=area.center))
+
+            # Desenha texto 'f' (laranja)
+            if f_text:
+                f_surf: pygame.Surface = self.font_botao_sub.render(f_text, True, c.COR_TEXTO_BOTAO_LARANJA)
+                surf.blit(f_surf, f_surf.get_rect(center=(area.centerx, area.top + 6)))
+
+            # Desenha texto 'g' (azul)
+            if g_text:
+                g_surf: pygame.Surface = self.font_botao_sub.render(g_text, True, c.COR_TEXTO_BOTAO_AZUL)
+                # Posição do texto g depende se há texto f
+                g_pos_y: int = area.bottom - 10 if not f_text else area.bottom - 5
+                surf.blit(g_surf, g_surf.get_rect(center=(area.centerx, g_pos_y)))
+
+            # Converte para o formato de pixel da tela, tornando cada blit uma cópia direta
+            self._button_cache.append((rect, surf.convert(), main_text))
 
     def _desenha_corpo(self) -> None:
         """
@@ -58,115 +148,127 @@ class UI:
         """
         Desenha todos os botões da calculadora na tela.
 
-        Itera sobre a lista de botões definida em constants.py, que agora contém
-        retângulos pré-definidos para cada botão, e os renderiza.
+        As superfícies dos botões são montadas uma única vez em `_monta_cache_botoes`;
+        aqui apenas são copiadas para a tela.
         """
-        self.botoes_rects.clear()
-        for botao_info in c.BOTOES:
-            rect: pygame.Rect = botao_info['rect'].move(c.MARGEM_CORPO, c.MARGEM_CORPO)
-            main_text: str = botao_info['main']
-            f_text: Optional[str] = botao_info['f']
-            g_text: Optional[str] = botao_info['g']
-            color_key: str = botao_info['color']
-
-            self.botoes_rects.append((rect, main_text))
-
-            cor_map: Dict[str, Tuple[int, int, int]] = {
-                'preto': c.COR_BOTAO_PRETO,
-                'azul': c.COR_BOTAO_AZUL,
-                'laranja': c.COR_BOTAO_LARANJA
-            }
-            pygame.draw.rect(self.screen, cor_map[color_key], rect, border_radius=5)
-
-            # Desenha texto principal
-            if main_text:
-                texto_surf: pygame.Surface = self.font_botao_main.render(main_text, True, c.COR_TEXTO_BOTAO_BRANCO)
-                texto_rect: pygame.Rect = texto_surf.get_rect(center=rect.center)
-                self.screen.blit(texto_surf, texto_rect)
-
-            # Desenha texto 'f' (laranja)
-            if f_text:
-                f_surf: pygame.Surface = self.font_botao_sub.render(f_text, True, c.COR_TEXTO_BOTAO_LARANJA)
-                f_rect: pygame.Rect = f_surf.get_rect(center=(rect.centerx, rect.top + 6))
-                self.screen.blit(f_surf, f_rect)
-
-            # Desenha texto 'g' (azul)
-            if g_text:
-                g_surf: pygame.Surface = self.font_botao_sub.render(g_text, True, c.COR_TEXTO_BOTAO_AZUL)
-                # Posição do texto g depende se há texto f
-                g_pos_y: int = rect.bottom - 10 if not f_text else rect.bottom - 5
-                g_rect: pygame.Rect = g_surf.get_rect(center=(rect.centerx, g_pos_y))
-                self.screen.blit(g_surf, g_rect)
+        for rect, surf, _ in self._button_cache:
+            self.screen.blit(surf, rect)
 
     def _desenha_pilha(self) -> None:
         """
         Desenha os valores da pilha (Y, Z, T) acima do display principal.
         """
-        # Posições relativas ao display principal
-        # A pilha é desenhada de baixo para cima (Y, Z, T)
-        # O valor 'Y' (stack[1]) será o mais próximo do display principal
-        base_y_pos = c.POS_Y_TELA +55 # Posição Y para a parte inferior do texto 'Y'
-        line_height = 20 # Altura aproximada de uma linha de texto da pilha
-        
         # Exibe Y, Z, T (índices 1, 2, 3 da pilha)
         # A ordem de exibição é T, Z, Y (de cima para baixo na tela)
         # Mas a iteração é feita para posicionar de baixo para cima
-        for i, label_text in enumerate(["Y", "Z", "T"]): # Y é o primeiro a ser posicionado (mais baixo)
-            stack_index = 1 + i # Y=stack[1], Z=stack[2], T=stack[3]
-            stack_value = self.calculator.stack[stack_index]
-            
-            # Formata o valor da pilha
-            formatted_value = self.calculator._format_number(stack_value, self.calculator.display_decimals)
-            
-            # Calcula a posição Y para a linha atual
-            current_y_pos = base_y_pos - (i * line_height)
-
-            text_surf = self.font_stack_small.render(f"{label_text}: {formatted_value}", True, c.COR_TEXTO_TELA)
-            text_rect = text_surf.get_rect(midright=(c.POS_X_TELA + c.LARGURA_TELA - 15, current_y_pos))
-            self.screen.blit(text_surf, text_rect)
+        stack = self.calculator.stack
+        decimals = self.calculator.display_decimals
+        for i, label_text in enumerate(("Y", "Z", "T")): # Y é o primeiro a ser posicionado (mais baixo)
+            stack_value = stack[1 + i] # Y=stack[1], Z=stack[2], T=stack[3]
+            # Compara pela string: Decimal('-0') == Decimal('0'), mas os dois são exibidos de forma diferente
+            chave = (str(stack_value), decimals)
+            linha = self._stack_surfs[i]
+            if linha is None or chave != self._last_stack[i]:
+                # Formata o valor da pilha e renderiza apenas as linhas alteradas
+                formatted_value = self.calculator._format_number(stack_value, decimals)
+                text_surf = self.font_stack_small.render(f"{label_text}: {formatted_value}", True, c.COR_TEXTO_TELA)
+                # Alinha à direita a partir da âncora pré-calculada da linha, sem criar um Rect
+                right_x, top_y = self._pilha_ancoras[i]
+                linha = (text_surf, (right_x - text_surf.get_width(), top_y))
+                self._stack_surfs[i] = linha
+                self._last_stack[i] = chave
+            self.screen.blit(*linha)
+
+    def _glyph(self, ch: str) -> Tuple[pygame.Surface, int, int]:
+        """
+        Retorna o glifo pré-renderizado de um caractere do visor, renderizando-o na primeira vez.
+        """
+        glyph = self._glyph_cache.get(ch)
+        if glyph is None:
+            surf: pygame.Surface = self.font_tela.render(ch, True, c.COR_TEXTO_TELA).convert_alpha()
+            centro_y: int = c.POS_Y_TELA + 35 + c.ALTURA_TELA // 2
+            glyph = (surf, surf.get_width(), centro_y - surf.get_height() // 2)
+            self._glyph_cache[ch] = glyph
+        return glyph
 
     def desenha_tela(self, texto: str) -> None:
         """
         Desenha o texto fornecido na tela da calculadora.
+
+        O texto é montado da direita para a esquerda a partir dos glifos em cache,
+        sem rasterizar a string inteira a cada quadro.
         """
         pygame.draw.rect(self.screen, c.COR_TELA_FUNDO, 
                          (c.POS_X_TELA, c.POS_Y_TELA, c.LARGURA_TELA, c.ALTURA_TELA), 
                          border_radius=5)
         
-        texto_surf: pygame.Surface = self.font_tela.render(texto, True, c.COR_TEXTO_TELA)
-        texto_rect: pygame.Rect = texto_surf.get_rect(midright=(c.POS_X_TELA + c.LARGURA_TELA - 15, c.POS_Y_TELA +35+ c.ALTURA_TELA / 2))
-        self.screen.blit(texto_surf, texto_rect)
+        x: int = c.POS_X_TELA + c.LARGURA_TELA - 15
+        for ch in reversed(texto):
+            surf, largura, y = self._glyph(ch)
+            x -= largura
+            self.screen.blit(surf, (x, y))
 
     def _desenha_indicadores(self, f_active: bool, g_active: bool) -> None:
         """
         Desenha os indicadores 'f' e 'g' na tela se estiverem ativos.
         """
         if f_active:
-            f_surf: pygame.Surface = self.font_indicador.render('f', True, c.COR_TEXTO_TELA)
-            f_rect: pygame.Rect = f_surf.get_rect(bottomleft=(c.POS_X_TELA + 10, c.POS_Y_TELA + c.ALTURA_TELA - 5))
-            self.screen.blit(f_surf, f_rect)
+            self.screen.blit(self._f_surf, self._f_pos)
         if g_active:
-            g_surf: pygame.Surface = self.font_indicador.render('g', True, c.COR_TEXTO_TELA)
-            g_rect: pygame.Rect = g_surf.get_rect(bottomleft=(c.POS_X_TELA + 25, c.POS_Y_TELA + c.ALTURA_TELA - 5))
-            self.screen.blit(g_surf, g_rect)
+            self.screen.blit(self._g_surf, self._g_pos)
 
     def desenha_tudo(self, f_active: bool, g_active: bool) -> None:
         """
         Chama todos os métodos de desenho para renderizar a calculadora completa.
+
+        Corpo e botões são estáticos e só são desenhados no primeiro quadro. Depois
+        disso, apenas a área do visor é redesenhada, e só quando o que ela mostra mudou.
         """
-        self.screen.fill(c.COR_FUNDO)
-        self._desenha_corpo()
-        self._desenha_botoes()
-        self.desenha_tela(self.calculator.get_display()) # Obtém o texto do display principal da calculadora
+        texto_tela: str = self.calculator.get_display() # Obtém o texto do display principal da calculadora
+        # Y, Z, T entram como string: Decimal('-0') == Decimal('0'), mas os dois são exibidos de forma diferente
+        stack = self.calculator.stack
+        estado = (texto_tela, f_active, g_active, self.calculator.display_decimals, str(stack[1]), str(stack[2]), str(stack[3]))
+        if estado == self._last_state:
+            return
+
+        primeiro_quadro: bool = self._last_state is None
+        self._last_state = estado
+
+        if primeiro_quadro:
+            self.screen.fill(c.COR_FUNDO)
+            self._desenha_corpo()
+            self._desenha_botoes()
+        else:
+            pygame.draw.rect(self.screen, c.COR_CORPO_CALCULADORA, self._area_visor)
+
+        self.desenha_tela(texto_tela)
         self._desenha_pilha() # Chama o novo método para desenhar a pilha
         self._desenha_indicadores(f_active, g_active)
-        pygame.display.flip()
+
+        if primeiro_quadro:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._area_visor)
 
     def get_botao_clicado(self, pos: Tuple[int, int]) -> Optional[str]:
         """
         Verifica se uma posição de clique corresponde a algum botão.
+
+        A linha e a coluna da grade são calculadas diretamente a partir da posição;
+        apenas os botões fora da grade (ENTER) são testados um a um.
         """
-        for rect, acao in self.botoes_rects:
-            if rect.collidepoint(pos):
+        x: int = pos[0] - c.MARGEM_CORPO - c.BX_START
+        y: int = pos[1] - c.MARGEM_CORPO - c.BY_START
+        if x >= 0 and y >= 0:
+            col, dx = divmod(x, c.BW + c.BSX)
+            row, dy = divmod(y, c.BH + c.BSY)
+            if dx < c.BW and dy < c.BH: # Fora do espaçamento entre botões
+                acao: Optional[str] = c.GRADE_BOTOES.get((row, col))
+                if acao:
+                    return acao
+
+        px, py = pos
+        for x1, y1, x2, y2, acao in self._hit_regions:
+            if x1 <= px < x2 and y1 <= py < y2:
                 return acao
         return None